@@ -3,7 +3,7 @@
 Thermal CSV End-to-End Processor
 --------------------------------
 - Loads FLUKE/FLIR-like CSV (with non-numeric headers, rows like: 1,27.4,27.3,...)
-- Cleans, shapes (480x640 or 240x320), imputes
+- Cleans, shapes (480x640 or 240x320), imputes (float32 throughout; ~0.1 °C sensor precision)
 - Produces basic stats & visualizations
 - Computes gradient map
 - Detects hotspots via gradient-first, hottest-first ranking
@@ -12,11 +12,15 @@ Thermal CSV End-to-End Processor
 Usage:
     python thermal_pipeline.py /path/to/input.csv --outdir /path/to/out \
         [--shape-override 480 640] [--gaussian-sigma 1.0] [--grad-pctl 97] \
-        [--region-min-area 50] [--ring-width 5] [--clip-lo 2] [--clip-hi 98]
+        [--region-min-area 50] [--ring-width 5] [--clip-lo 2] [--clip-hi 98] \
+        [--reuse-smoothed-gradient] [--plot-workers 1]
 
 Notes:
-- Uses only matplotlib for plotting (no seaborn). Each chart is its own figure.
+- Uses only matplotlib for plotting (no seaborn). Each chart is its own figure; figures can
+  optionally be rendered in parallel worker processes (--plot-workers).
+- Optional OpenCV (pip install opencv-python-headless) for faster gaussian, morphology & labeling.
 - Optional SciPy (for morphology & gaussian). Falls back to NumPy-only approximations.
+- Optional Numba (pip install numba) JIT-compiles the NumPy-only fallbacks when SciPy is absent.
 """
 
 import os
@@ -24,9 +28,15 @@ import io
 import csv
 import math
 import argparse
+import multiprocessing
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Tuple
 import numpy as np
-import matplotlib.pyplot as plt
+from numpy.lib.stride_tricks import sliding_window_view
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.image import imsave
 import pandas as pd
 
 # Optional SciPy for better image morphology & gaussian filtering
@@ -36,6 +46,27 @@ try:
 except Exception:
     SCIPY_AVAILABLE = False
 
+# Optional OpenCV: SIMD-optimized gaussian, morphology & labeling, preferred over SciPy when present
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except Exception:
+    CV2_AVAILABLE = False
+
+# Optional Numba for JIT-compiled fallback kernels
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except Exception:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        # no-op stand-in: kernels below then run as plain Python
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
 
 # ---------- Utilities ----------
 
@@ -67,59 +98,105 @@ def is_numeric_row(tokens: List[str]) -> bool:
         return False
 
 
-def safe_float(tok: str) -> float:
-    try:
-        return float(tok)
-    except Exception:
-        return np.nan
-
-
 def gaussian_smooth(arr: np.ndarray, sigma: float) -> np.ndarray:
+    if CV2_AVAILABLE and sigma > 0 and arr.dtype in (np.float32, np.float64):
+        # same support as ndi.gaussian_filter (truncate=4.0) and its default 'reflect' mode
+        ksize = 2 * int(4 * sigma + 0.5) + 1
+        return cv2.GaussianBlur(arr, (ksize, ksize), sigma, borderType=cv2.BORDER_REFLECT)
     if SCIPY_AVAILABLE:
         return ndi.gaussian_filter(arr, sigma=sigma)
-    # Fallback separable Gaussian (simple 1D kernel)
+    # Fallback separable Gaussian (simple 1D kernel truncated at 3 sigma, zero-padded)
     radius = max(1, int(math.ceil(3*sigma)))
     x = np.arange(-radius, radius+1)
     kernel = np.exp(-(x**2)/(2*sigma*sigma))
-    kernel = kernel / kernel.sum()
-    tmp = np.apply_along_axis(lambda m: np.convolve(m, kernel, mode="same"), axis=1, arr=arr)
-    out = np.apply_along_axis(lambda m: np.convolve(m, kernel, mode="same"), axis=0, arr=tmp)
+    kernel = (kernel / kernel.sum()).astype(np.result_type(arr, np.float32))
+    k = kernel.size
+    padded = np.pad(arr, ((0, 0), (radius, radius)))
+    tmp = np.einsum('ijk,k->ij', sliding_window_view(padded, k, axis=1), kernel)
+    padded = np.pad(tmp, ((radius, radius), (0, 0)))
+    out = np.einsum('ijk,k->ij', sliding_window_view(padded, k, axis=0), kernel)
     return out
 
 
 def maximum_filter(arr: np.ndarray, size: int) -> np.ndarray:
-    # Naive 2D max filter (edge-padded) for fallback when SciPy absent
+    # Separable 2D max filter (edge-padded) for fallback when SciPy absent
     H, W = arr.shape
     k = size
     pad = k // 2
     padded = np.pad(arr, pad, mode='edge')
-    out = np.empty_like(arr)
-    for r in range(H):
-        for c in range(W):
-            window = padded[r:r+k, c:c+k]
-            out[r, c] = window.max()
+    tmp = sliding_window_view(padded, k, axis=1)[:, :W].max(axis=-1)
+    return sliding_window_view(tmp, k, axis=0)[:H].max(axis=-1)
+
+
+def disk(r: int) -> np.ndarray:
+    y, x = np.ogrid[-r:r+1, -r:r+1]
+    return (x*x + y*y) <= r*r
+
+
+# Bitpacked binary masks: each row is stored as uint64 words, 64 pixels per word
+# (pixel c -> bit c % 64 of word c // 64), so 3x3 morphology is a handful of
+# shift/OR (or AND) ops per word instead of per pixel.
+
+def pack_mask(mask: np.ndarray) -> np.ndarray:
+    """(H, W) bool -> (H, ceil(W/64)) uint64, padding bits zero."""
+    H, W = mask.shape
+    nwords = -(-W // 64)
+    bits = np.zeros((H, nwords * 64), dtype=bool)
+    bits[:, :W] = mask
+    return np.packbits(bits, axis=1, bitorder="little").view("<u8").astype(np.uint64)
+
+
+def unpack_mask(packed: np.ndarray, W: int) -> np.ndarray:
+    """Inverse of pack_mask."""
+    as_bytes = packed.astype("<u8").view(np.uint8)
+    return np.unpackbits(as_bytes, axis=1, count=W, bitorder="little").astype(bool)
+
+
+def morph3x3_packed(packed: np.ndarray, W: int, erode: bool = False) -> np.ndarray:
+    """3x3 dilation (OR) or erosion (AND) of a packed mask; outside pixels are ignored,
+    which is what edge-padded 3x3 max/min filters do for binary input."""
+    H, nwords = packed.shape
+    op = np.bitwise_and if erode else np.bitwise_or
+    ones = np.uint64(0xFFFFFFFFFFFFFFFF)
+    fill = ones if erode else np.uint64(0)
+    one, top = np.uint64(1), np.uint64(63)
+    tail = W - (nwords - 1) * 64
+    valid = np.uint64((1 << tail) - 1) if tail < 64 else ones
+    words = packed.copy()
+    words[:, -1] |= fill & ~valid  # padding bits behave like outside pixels
+    ext = np.full((H, nwords + 2), fill, dtype=np.uint64)
+    ext[:, 1:-1] = words
+    from_left = (words << one) | (ext[:, :-2] >> top)   # pixel c sees c-1
+    from_right = (words >> one) | (ext[:, 2:] << top)   # pixel c sees c+1
+    rows = op(op(words, from_left), from_right)
+    out = rows.copy()
+    if H > 1:
+        op(out[1:], rows[:-1], out=out[1:])
+        op(out[:-1], rows[1:], out=out[:-1])
+    out[:, -1] &= valid
     return out
 
 
-def minimum_filter(arr: np.ndarray, size: int) -> np.ndarray:
-    H, W = arr.shape
-    k = size
-    pad = k // 2
-    padded = np.pad(arr, pad, mode='edge')
-    out = np.empty_like(arr)
-    for r in range(H):
-        for c in range(W):
-            window = padded[r:r+k, c:c+k]
-            out[r, c] = window.min()
-    return out
+_SE_CLOSE_U8 = disk(2).astype(np.uint8)
+_SE_DIL_U8 = disk(1).astype(np.uint8)
 
 
 def binary_morphology(mask: np.ndarray) -> np.ndarray:
     """Closing (disk radius 2), then dilation (radius 1), then fill holes."""
+    if CV2_AVAILABLE:
+        # One zero-framed buffer: closing and dilation write into its interior, and the
+        # frame lets a single flood from (0, 0) reach all background connected to the border.
+        H, W = mask.shape
+        buf = np.zeros((H + 2, W + 2), dtype=np.uint8)
+        inner = buf[1:-1, 1:-1]
+        # zero border, as in ndi.binary_closing (OpenCV's default border ignores the outside)
+        cv2.morphologyEx(mask.astype(np.uint8), cv2.MORPH_CLOSE, _SE_CLOSE_U8, dst=inner,
+                         borderType=cv2.BORDER_CONSTANT, borderValue=0)
+        cv2.dilate(inner, _SE_DIL_U8, dst=inner)
+        # fill holes: background not reached by a 4-connected flood from outside is a hole
+        cv2.floodFill(buf, None, (0, 0), 2, flags=4)
+        return inner != 2
     if SCIPY_AVAILABLE:
-        def disk(r):
-            y, x = np.ogrid[-r:r+1, -r:r+1]
-            return (x*x + y*y) <= r*r
         se_close = disk(2)
         se_dil   = disk(1)
         closed   = ndi.binary_closing(mask, structure=se_close)
@@ -127,72 +204,272 @@ def binary_morphology(mask: np.ndarray) -> np.ndarray:
         filled   = ndi.binary_fill_holes(dilated)
         return filled.astype(bool)
     else:
-        # Fallback: approximate with min/max filters
-        eroded  = minimum_filter(mask.astype(int), size=3) > 0
-        dilated = maximum_filter(eroded.astype(int), size=3) > 0
-        dilated = maximum_filter(dilated.astype(int), size=3) > 0  # extra dilation
-        return dilated.astype(bool)
+        # Fallback: approximate with 3x3 min/max filters on bitpacked rows
+        W = mask.shape[1]
+        packed  = pack_mask(mask)
+        packed  = morph3x3_packed(packed, W, erode=True)
+        packed  = morph3x3_packed(packed, W)
+        packed  = morph3x3_packed(packed, W)  # extra dilation
+        return unpack_mask(packed, W)
+
+
+@njit(cache=True)
+def _find_root(parents, i):
+    root = i
+    while parents[root] < root:
+        root = parents[root]
+    while parents[i] < i:  # path compression
+        nxt = parents[i]
+        parents[i] = root
+        i = nxt
+    return root
+
+
+@njit(cache=True)
+def _union(parents, i, j):
+    ri = _find_root(parents, i)
+    rj = _find_root(parents, j)
+    # keep the smaller (earlier raster) label as root so pass 2 numbers in raster order
+    if ri < rj:
+        parents[rj] = ri
+        return ri
+    if rj < ri:
+        parents[ri] = rj
+    return rj
+
+
+@njit(cache=True)
+def _label_two_pass(mask_u8, labels_i32, H, W):
+    """4-connected two-pass (SAUF) labeling over flat row-major buffers; returns the label count."""
+    parents = np.empty((H * W + 1) // 2 + 1, np.int32)
+    parents[0] = 0
+    nprov = 0
+    # Pass 1: provisional labels from the north/west neighbours
+    for r in range(H):
+        row = r * W
+        for c in range(W):
+            p = row + c
+            if mask_u8[p] == 0:
+                continue
+            up = labels_i32[p - W] if r > 0 else 0
+            left = labels_i32[p - 1] if c > 0 else 0
+            if up != 0:
+                if left != 0 and left != up:
+                    labels_i32[p] = _union(parents, up, left)
+                else:
+                    labels_i32[p] = up
+            elif left != 0:
+                labels_i32[p] = left
+            else:
+                nprov += 1
+                parents[nprov] = nprov
+                labels_i32[p] = nprov
+    # Flatten: roots get consecutive labels; non-roots point at a smaller, already-final entry
+    count = 0
+    for k in range(1, nprov + 1):
+        if parents[k] == k:
+            count += 1
+            parents[k] = count
+        else:
+            parents[k] = parents[parents[k]]
+    # Pass 2: relabel
+    for p in range(H * W):
+        labels_i32[p] = parents[labels_i32[p]]
+    return count
 
 
 def label_components(mask: np.ndarray):
+    if CV2_AVAILABLE:
+        nlab, labeled = cv2.connectedComponents(mask.astype(np.uint8), connectivity=4, ltype=cv2.CV_32S)
+        return labeled, nlab - 1
     if SCIPY_AVAILABLE:
         labeled, nlab = ndi.label(mask)
         return labeled, nlab
     else:
-        # Simple BFS (4-connected) fallback
-        labeled = np.zeros(mask.shape, dtype=int)
-        current = 0
+        # Two-pass union-find (4-connected) fallback, JIT-compiled when Numba is available
         h, w = mask.shape
-        for r in range(h):
-            for c in range(w):
-                if mask[r, c] and labeled[r, c] == 0:
-                    current += 1
-                    stack = [(r, c)]
-                    labeled[r, c] = current
-                    while stack:
-                        rr, cc = stack.pop()
-                        for dr, dc in [(1,0),(-1,0),(0,1),(0,-1)]:
-                            nr, nc = rr+dr, cc+dc
-                            if 0 <= nr < h and 0 <= nc < w and mask[nr, nc] and labeled[nr, nc] == 0:
-                                labeled[nr, nc] = current
-                                stack.append((nr, nc))
-        return labeled, current
+        mask_u8 = np.ascontiguousarray(mask, dtype=np.uint8).ravel()
+        labels = np.zeros(h * w, dtype=np.int32)
+        current = _label_two_pass(mask_u8, labels, h, w)
+        return labels.reshape(h, w), int(current)
 
 
 def remove_small_components(labeled: np.ndarray, min_area: int) -> np.ndarray:
-    mask = labeled > 0
-    if not np.any(mask):
-        return mask
-    labels = np.unique(labeled[mask])
-    keep = np.zeros_like(labeled, dtype=bool)
-    for lab in labels:
-        if np.sum(labeled == lab) >= min_area:
-            keep |= (labeled == lab)
-    return keep
-
-
-def dilate_mask(mask: np.ndarray, radius: int) -> np.ndarray:
-    if radius <= 0:
-        return mask
+    # per-label areas in one pass, then a label -> keep lookup table
+    areas = np.bincount(labeled.ravel(), minlength=1)
+    keep = areas >= min_area
+    keep[0] = False
+    return keep[labeled]
+
+
+def region_stats(T: np.ndarray, labeled: np.ndarray, nlab: int):
+    """Per-label (area, Tmax, Tmean, peak row, peak col) for labels 1..nlab via grouped reductions."""
+    idx = np.arange(1, nlab+1)
+    flat = labeled.ravel()
+    areas = np.bincount(flat, minlength=nlab+1)[1:]
     if SCIPY_AVAILABLE:
-        y, x = np.ogrid[-radius:radius+1, -radius:radius+1]
-        se = (x*x + y*y) <= radius*radius
-        return ndi.binary_dilation(mask, structure=se)
+        Tmax = np.asarray(ndi.maximum(T, labeled, idx), dtype=float)
+        Tmean = np.asarray(ndi.mean(T, labeled, idx), dtype=float)
     else:
-        out = mask.copy()
-        for _ in range(radius):
-            out = maximum_filter(out.astype(int), size=3) > 0
-        return out
+        vals = T.ravel()
+        Tmax = np.full(nlab+1, -np.inf)
+        np.maximum.at(Tmax, flat, vals)
+        Tmax = Tmax[1:]
+        Tmean = np.bincount(flat, weights=vals, minlength=nlab+1)[1:] / np.maximum(areas, 1)
+    # Peak = first raster-order pixel reaching Tmax (np.argmax tie-breaking; ndi.maximum_position
+    # does not guarantee this on ties, which are common at 0.1 °C resolution)
+    lut = np.concatenate(([np.inf], Tmax))
+    peak_px = np.flatnonzero(T.ravel() == lut[flat])
+    peak_labs, first = np.unique(flat[peak_px], return_index=True)
+    peak_idx = np.zeros(nlab+1, dtype=np.intp)
+    peak_idx[peak_labs] = peak_px[first]
+    peak_rows, peak_cols = np.unravel_index(peak_idx[1:], T.shape)
+    return areas, Tmax, Tmean, peak_rows, peak_cols
+
+
+def labeled_median(values: np.ndarray, labels: np.ndarray, nlab: int) -> np.ndarray:
+    """Median of values per label 1..nlab (NaN for empty labels) via one sort."""
+    sel = labels > 0
+    lab = labels[sel]
+    order = np.lexsort((values[sel], lab))
+    v = values[sel][order]
+    counts = np.bincount(lab, minlength=nlab+1)[1:]
+    starts = np.cumsum(counts) - counts
+    med = np.full(nlab, np.nan)
+    ok = counts > 0
+    lo = starts[ok] + (counts[ok] - 1) // 2
+    hi = starts[ok] + counts[ok] // 2
+    med[ok] = 0.5 * (v[lo] + v[hi])
+    return med
+
+
+@njit(cache=True)
+def _grow_labels_3x3(labels, steps):
+    """steps rounds of np.where(grown == 0, maximum_filter(grown, 3), grown), fused:
+    background pixels take the largest label in their edge-clamped 3x3 window."""
+    H, W = labels.shape
+    cur = labels.copy()
+    nxt = labels.copy()
+    for _ in range(steps):
+        for r in range(H):
+            r0 = r - 1 if r > 0 else 0
+            r1 = r + 1 if r < H - 1 else H - 1
+            for c in range(W):
+                v = cur[r, c]
+                if v == 0:
+                    c0 = c - 1 if c > 0 else 0
+                    c1 = c + 1 if c < W - 1 else W - 1
+                    for rr in range(r0, r1 + 1):
+                        for cc in range(c0, c1 + 1):
+                            if cur[rr, cc] > v:
+                                v = cur[rr, cc]
+                nxt[r, c] = v
+        cur, nxt = nxt, cur
+    return cur
+
+
+def ring_backgrounds(T: np.ndarray, labeled: np.ndarray, nlab: int, ring_width: int) -> np.ndarray:
+    """Median T of each region's background ring, NaN where the ring is empty.
+
+    Every background pixel within ring_width of a region is assigned to its nearest region,
+    so all rings come out of one pass instead of one dilation per region.
+    """
+    bg = labeled == 0
+    if nlab == 0 or ring_width <= 0 or not bg.any():
+        return np.full(nlab, np.nan)
+    if SCIPY_AVAILABLE:
+        dist, (iy, ix) = ndi.distance_transform_edt(bg, return_indices=True)
+        ring_label = np.where(bg & (dist <= ring_width), labeled[iy, ix], 0)
+        counts = np.bincount(ring_label.ravel(), minlength=nlab+1)[1:]
+        Tbg = np.asarray(ndi.median(T, ring_label, np.arange(1, nlab+1)), dtype=float)
+        Tbg[counts == 0] = np.nan
+        return Tbg
+    # Fallback: grow labels into the background one 3x3 step at a time (square rings)
+    if NUMBA_AVAILABLE and labeled.dtype == np.int32 and labeled.flags.c_contiguous:
+        grown = _grow_labels_3x3(labeled, ring_width)
+    else:
+        grown = labeled
+        for _ in range(ring_width):
+            grown = np.where(grown == 0, maximum_filter(grown, size=3), grown)
+    ring_label = np.where(bg, grown, 0)
+    return labeled_median(T.ravel(), ring_label.ravel(), nlab)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _gradient_magnitude_f32(arr):
+    """Fused np.gradient + magnitude: one pass over arr, central differences inside,
+    one-sided differences on the borders (np.gradient edge_order=1). The border columns
+    are peeled so the inner loop has no clamping or division and vectorizes."""
+    H, W = arr.shape
+    G = np.empty((H, W), np.float32)
+    half = np.float32(0.5)
+    for r in prange(H):
+        rm = r - 1 if r > 0 else 0
+        rp = r + 1 if r < H - 1 else H - 1
+        sy = np.float32(1.0) if rp - rm == 1 else half
+        gy = (arr[rp, 0] - arr[rm, 0]) * sy
+        gx = arr[r, 1] - arr[r, 0]
+        G[r, 0] = np.sqrt(gx * gx + gy * gy)
+        for c in range(1, W - 1):
+            gy = (arr[rp, c] - arr[rm, c]) * sy
+            gx = (arr[r, c + 1] - arr[r, c - 1]) * half
+            G[r, c] = np.sqrt(gx * gx + gy * gy)
+        gy = (arr[rp, W - 1] - arr[rm, W - 1]) * sy
+        gx = arr[r, W - 1] - arr[r, W - 2]
+        G[r, W - 1] = np.sqrt(gx * gx + gy * gy)
+    return G
+
+
+def gradient_magnitude(arr: np.ndarray) -> np.ndarray:
+    """|grad arr|: fused Numba kernel for C-contiguous float32 (what the pipeline produces),
+    else computed in place in the np.gradient outputs (no gx**2 / gy**2 temporaries)."""
+    if (NUMBA_AVAILABLE and arr.ndim == 2 and arr.dtype == np.float32
+            and arr.flags.c_contiguous and min(arr.shape) >= 2):
+        return _gradient_magnitude_f32(arr)
+    gy, gx = np.gradient(arr)
+    gx *= gx
+    gy *= gy
+    gx += gy
+    return np.sqrt(gx, out=gx)
+
+
+def select_percentile(arr: np.ndarray, q: float):
+    """Single percentile via quickselect (np.partition), same linear interpolation as np.percentile."""
+    flat = arr.ravel()
+    pos = q / 100 * (flat.size - 1)
+    lo = int(math.floor(pos))
+    hi = min(lo + 1, flat.size - 1)
+    part = np.partition(flat, [lo, hi])
+    return part[lo] + (part[hi] - part[lo]) * (pos - lo)
 
 
 def ensure_outdir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def save_fig(outdir: str, fname: str) -> str:
+_FIG = None
+
+
+def new_figure() -> Figure:
+    """Per-process Agg figure, cleared and reused for every plot (no pyplot state machine)."""
+    global _FIG
+    if _FIG is None:
+        _FIG = Figure()
+        FigureCanvasAgg(_FIG)
+    else:
+        _FIG.clear()
+    return _FIG
+
+
+def save_fig(fig: Figure, outdir: str, fname: str) -> str:
+    path = os.path.join(outdir, fname)
+    fig.savefig(path, dpi=150, bbox_inches="tight")
+    return path
+
+
+def save_image(outdir: str, fname: str, arr: np.ndarray, **kwargs) -> str:
     path = os.path.join(outdir, fname)
-    plt.savefig(path, dpi=150, bbox_inches="tight")
-    plt.close()
+    imsave(path, arr, origin="upper", **kwargs)
     return path
 
 
@@ -203,28 +480,36 @@ def load_and_clean_csv(input_path: str,
                        shape_override=None):
     enc, lines = try_read_lines_with_encoding(input_path, ["utf-8", "utf-16", "utf-16-le", "utf-16-be"])
 
-    # find first numeric row
-    start_idx = None
-    for i, line in enumerate(lines):
-        tokens = [t.strip() for t in line.split(",")]
-        if is_numeric_row(tokens):
-            start_idx = i
-            break
-    if start_idx is None:
+    # keep numeric rows only: integer index followed by a float (only the first two tokens
+    # are inspected in Python; the cell values are left to the C parser below)
+    body = [line for line in lines if is_numeric_row([t.strip() for t in line.split(",", 2)[:2]])]
+    if not body:
         raise RuntimeError("No numeric data rows found in the CSV.")
 
-    rows = []
-    for line in lines[start_idx:]:
-        toks = [t.strip() for t in line.split(",")]
-        if not is_numeric_row(toks):
-            continue
-        vals = [safe_float(t) for t in toks[1:]]  # drop index
-        rows.append(vals)
-
-    num_rows_observed = len(rows)
+    # Name at least as many fields as the widest row / candidate shape so the C reader
+    # NaN-pads ragged rows instead of sizing the frame off the first (possibly short) one.
+    candidate_shapes = [shape_override] if shape_override is not None else standard_shapes
+    n_fields = max(max(line.count(",") for line in body) + 1,
+                   max(tc for _, tc in candidate_shapes) + 2)
+    block = "\n".join(body)
+    read_kw = dict(header=None, engine="c", names=range(n_fields), na_values=[""])
+    try:
+        # footer/header text is already filtered out, so cells parse straight to float32
+        data = pd.read_csv(io.StringIO(block), dtype=np.float32, **read_kw).to_numpy()
+    except ValueError:
+        # stray non-numeric cells inside data rows -> NaN
+        df = pd.read_csv(io.StringIO(block), low_memory=False, **read_kw)
+        data = df.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float32)
+    rows = data[:, 1:]  # drop index
+
+    num_rows_observed = rows.shape[0]
     if num_rows_observed == 0:
         raise RuntimeError("No numeric rows parsed.")
-    median_cols = int(np.median([len(r) for r in rows]))
+    # per-row width = position of the last parsed field (short rows are NaN-padded)
+    present = ~np.isnan(rows)
+    row_lens = rows.shape[1] - np.argmax(present[:, ::-1], axis=1)
+    row_lens[~present.any(axis=1)] = 0
+    median_cols = int(np.median(row_lens))
 
     # target shape
     if shape_override is not None:
@@ -241,35 +526,24 @@ def load_and_clean_csv(input_path: str,
     target_rows, target_cols = TARGET_SHAPE
 
     # global median
-    all_vals = [v for r in rows for v in r if not np.isnan(v)]
-    global_median = float(np.median(all_vals)) if all_vals else 0.0
-
-    processed_rows = []
-    for r in rows[:target_rows]:
-        if len(r) > target_cols:
-            rr = r[:target_cols]
-        else:
-            rr = r + [np.nan] * (target_cols - len(r))
-        row_vals = [v for v in rr if not np.isnan(v)]
-        row_median = float(np.median(row_vals)) if row_vals else global_median
-        rr = [row_median if np.isnan(v) else v for v in rr]
-        processed_rows.append(rr)
-
-    while len(processed_rows) < target_rows:
-        processed_rows.append([global_median] * target_cols)
-
-    T = np.array(processed_rows, dtype=float)
-
-    # fill any remaining NaNs by row medians then global
-    if np.isnan(T).any():
-        for i in range(T.shape[0]):
-            row = T[i]
-            mask = np.isnan(row)
-            if np.any(mask):
-                vals = row[~mask]
-                med = float(np.median(vals)) if vals.size > 0 else global_median
-                row[mask] = med
-                T[i] = row
+    all_vals = rows[~np.isnan(rows)]
+    global_median = float(np.median(all_vals)) if all_vals.size else 0.0
+
+    # pad/truncate into the target shape; missing rows take the global median
+    T = np.full((target_rows, target_cols), np.nan, dtype=np.float32)
+    n_r = min(target_rows, num_rows_observed)
+    n_c = min(target_cols, rows.shape[1])
+    T[:n_r, :n_c] = rows[:n_r, :n_c]
+    T[n_r:] = global_median
+
+    # fill NaNs by row medians then global
+    mask = np.isnan(T)
+    if mask.any():
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows
+            row_meds = np.nanmedian(T, axis=1)
+        row_meds = np.where(np.isnan(row_meds), global_median, row_meds)
+        T[mask] = np.broadcast_to(row_meds[:, None], T.shape)[mask]
 
     return enc, T, TARGET_SHAPE
 
@@ -287,23 +561,23 @@ def basic_stats(T: np.ndarray, clip_lo=2, clip_hi=98):
     return stats_text, p_lo, p_hi
 
 
-def gradient_map(T: np.ndarray):
-    gy, gx = np.gradient(T)
-    G = np.sqrt(gx**2 + gy**2)
+def gradient_map(T: np.ndarray, G=None):
+    """Gradient magnitude of T plus a stats line; pass a precomputed G to skip the gradient pass."""
+    if G is None:
+        G = gradient_magnitude(T)
     g_stats = (
         f"Gradient stats: min(G)={np.min(G):.6f} °C/pixel, "
         f"max(G)={np.max(G):.6f} °C/pixel, "
         f"mean(G)={np.mean(G):.6f} ± {np.std(G):.6f} °C/pixel, "
-        f"p95(G)={np.percentile(G,95):.6f} °C/pixel"
+        f"p95(G)={select_percentile(G,95):.6f} °C/pixel"
     )
     return G, g_stats
 
 
 def hotspot_detection(T: np.ndarray, gaussian_sigma=1.0, grad_pctl=97, region_min_area=50, ring_width=5):
     T_s = gaussian_smooth(T, gaussian_sigma)
-    gys, gxs = np.gradient(T_s)
-    G_s = np.sqrt(gxs**2 + gys**2)
-    tau = np.percentile(G_s, grad_pctl)
+    G_s = gradient_magnitude(T_s)
+    tau = select_percentile(G_s, grad_pctl)
     M0 = G_s >= tau
 
     M = binary_morphology(M0)
@@ -312,28 +586,22 @@ def hotspot_detection(T: np.ndarray, gaussian_sigma=1.0, grad_pctl=97, region_mi
     labeled_clean, nlab = label_components(M_clean)
 
     H, W = T.shape
+    areas, Tmaxs, Tmeans, peak_rows, peak_cols = region_stats(T, labeled_clean, nlab)
+    Tbgs = ring_backgrounds(T, labeled_clean, nlab, ring_width)
     regions = []
     for lab in range(1, nlab+1):
-        coords = np.argwhere(labeled_clean == lab)
-        if coords.size == 0:
+        area = int(areas[lab-1])
+        if area == 0:
             continue
-        area = coords.shape[0]
-        rr, cc = coords[:,0], coords[:,1]
-        vals = T[rr, cc]
-        Tmax = float(np.max(vals))
-        max_idx = np.argmax(vals)
-        rmax, cmax = int(rr[max_idx]), int(cc[max_idx])
-        Tmean = float(np.mean(vals))
-
-        mask_R = (labeled_clean == lab)
-        dilated_R = dilate_mask(mask_R, ring_width)
-        ring = np.logical_and(dilated_R, ~mask_R)
-        ring_vals = T[ring]
-        if ring_vals.size == 0 or np.all(np.isnan(ring_vals)):
-            outside_vals = T[~mask_R]
+        Tmax = float(Tmaxs[lab-1])
+        rmax, cmax = int(peak_rows[lab-1]), int(peak_cols[lab-1])
+        Tmean = float(Tmeans[lab-1])
+
+        Tbg = float(Tbgs[lab-1])
+        if np.isnan(Tbg):
+            # empty ring: fall back to everything outside the region
+            outside_vals = T[labeled_clean != lab]
             Tbg = float(np.median(outside_vals)) if outside_vals.size > 0 else float(np.median(T))
-        else:
-            Tbg = float(np.median(ring_vals))
         deltaT = Tmax - Tbg
         regions.append({
             "ID": lab,
@@ -350,84 +618,104 @@ def hotspot_detection(T: np.ndarray, gaussian_sigma=1.0, grad_pctl=97, region_mi
     return G_s, tau, M_clean, labeled_clean, regions_sorted
 
 
-def plot_and_save_all(T, outdir, p2, p98, G, Gs, tau, M_clean, labeled_clean, regions_sorted):
-    # 1) Histogram
-    plt.figure()
-    plt.hist(T.ravel(), bins=64)
-    plt.xlabel("Temperature (°C)"); plt.ylabel("Frequency"); plt.title("Histogram of Temperature Values")
-    save_fig(outdir, "histogram.png")
-
-    # 2) Thermal (jet)
-    plt.figure()
-    im = plt.imshow(T, cmap="jet", origin="upper", vmin=p2, vmax=p98)
-    plt.colorbar(im, label="°C"); plt.title("Thermal Image (jet)")
-    save_fig(outdir, "thermal_jet.png")
-
-    # 3) Thermal (inferno)
-    plt.figure()
-    im = plt.imshow(T, cmap="inferno", origin="upper", vmin=p2, vmax=p98)
-    plt.colorbar(im, label="°C"); plt.title("Thermal Image (inferno)")
-    save_fig(outdir, "thermal_inferno.png")
-
-    # 4) Gradient map
-    plt.figure()
-    im = plt.imshow(G, cmap="inferno", origin="upper")
-    plt.colorbar(im, label="°C/pixel"); plt.title("Thermal Gradient Magnitude Map")
-    save_fig(outdir, "gradient_map.png")
-
-    # 5) Gradient threshold overlay
-    plt.figure()
-    im = plt.imshow(Gs, cmap="inferno", origin="upper")
-    plt.colorbar(im, label="°C/pixel")
-    plt.contour(Gs, levels=[tau], linewidths=1.5)
-    plt.title(f"Gradient Map with Threshold Overlay (τ={tau:.4f})")
-    save_fig(outdir, "gradient_threshold_overlay.png")
-
-    # 6) Binary mask
-    plt.figure()
-    plt.imshow(M_clean, origin="upper")
-    plt.title("Candidate Hot Regions (Binary Mask)")
-    save_fig(outdir, "binary_mask.png")
-
-    # 7) Top hotspot overlay
-    plt.figure()
-    im = plt.imshow(T, cmap="inferno", origin="upper", vmin=p2, vmax=p98)
-    plt.colorbar(im, label="°C"); plt.title("Top Hotspot Overlay")
-    if len(regions_sorted) > 0:
-        top = regions_sorted[0]
-        top_id = top["ID"]
-        top_mask = (labeled_clean == top_id).astype(float)
-        plt.contour(top_mask, levels=[0.5], colors=["red"], linewidths=2.0)
-        plt.plot(top["col"], top["row"], marker="o", markersize=6, markerfacecolor="none", markeredgecolor="white", linewidth=0)
+# Each plot is a self-contained task taking only picklable arrays, so figures can be
+# rendered in parallel worker processes.
+
+def _plot_histogram(outdir, T):
+    fig = new_figure()
+    ax = fig.add_subplot()
+    ax.hist(T.ravel(), bins=64)
+    ax.set_xlabel("Temperature (°C)"); ax.set_ylabel("Frequency"); ax.set_title("Histogram of Temperature Values")
+    return save_fig(fig, outdir, "histogram.png")
+
+
+# Image-only outputs are written pixel-for-pixel with imsave (no axes, colorbar or
+# title, so no layout pass or second tight-bbox render).
+
+def _plot_thermal(outdir, T, p2, p98, cmap, fname):
+    return save_image(outdir, fname, T, cmap=cmap, vmin=p2, vmax=p98)
+
+
+def _plot_gradient_map(outdir, G):
+    return save_image(outdir, "gradient_map.png", G, cmap="inferno")
+
+
+def _plot_threshold_overlay(outdir, Gs, tau):
+    fig = new_figure()
+    ax = fig.add_subplot()
+    im = ax.imshow(Gs, cmap="inferno", origin="upper")
+    fig.colorbar(im, ax=ax, label="°C/pixel")
+    ax.contour(Gs, levels=[tau], linewidths=1.5)
+    ax.set_title(f"Gradient Map with Threshold Overlay (τ={tau:.4f})")
+    return save_fig(fig, outdir, "gradient_threshold_overlay.png")
+
+
+def _plot_binary_mask(outdir, M_clean):
+    return save_image(outdir, "binary_mask.png", M_clean.astype(np.uint8), vmin=0, vmax=1)
+
+
+def _plot_hotspot_overlay(outdir, T, p2, p98, top, top_mask):
+    fig = new_figure()
+    ax = fig.add_subplot()
+    im = ax.imshow(T, cmap="inferno", origin="upper", vmin=p2, vmax=p98)
+    fig.colorbar(im, ax=ax, label="°C"); ax.set_title("Top Hotspot Overlay")
+    if top is not None:
+        ax.contour(top_mask.astype(float), levels=[0.5], colors=["red"], linewidths=2.0)
+        ax.plot(top["col"], top["row"], marker="o", markersize=6, markerfacecolor="none", markeredgecolor="white", linewidth=0)
         label = f"Tmax={top['Tmax_C']:.2f}°C, ΔT={top['DeltaT_C']:.2f}°C"
-        plt.text(top["col"]+5, top["row"]+5, label, fontsize=9, color="white",
-                 bbox=dict(facecolor="black", alpha=0.4, pad=2))
-    save_fig(outdir, "thermal_hotspot_overlay.png")
-
-    # 8) Top 3 overlay on mask
-    plt.figure()
-    plt.imshow(M_clean, origin="upper", alpha=0.3)
-    plt.title("Top 3 Hotspots Overlay (hottest→coolest)")
-    colors = ["red", "green", "blue"]
-    for idx, reg in enumerate(regions_sorted[:3]):
-        mask_i = (labeled_clean == reg["ID"]).astype(float)
-        plt.contour(mask_i, levels=[0.5], colors=[colors[idx]], linewidths=2.0)
-    save_fig(outdir, "top3_hotspots_mask.png")
+        ax.text(top["col"]+5, top["row"]+5, label, fontsize=9, color="white",
+                bbox=dict(facecolor="black", alpha=0.4, pad=2))
+    return save_fig(fig, outdir, "thermal_hotspot_overlay.png")
+
 
-    # 9) Top 3 over candidate mask
-    plt.figure()
-    plt.imshow(M_clean, origin="upper", alpha=0.4)
-    plt.title("Top 3 Overlaid on Candidate Mask")
-    for idx, reg in enumerate(regions_sorted[:3]):
-        mask_i = (labeled_clean == reg["ID"]).astype(float)
-        plt.contour(mask_i, levels=[0.5], colors=[["red","green","blue"][idx]], linewidths=2.0)
-    save_fig(outdir, "overlay_candidate_hotspots.png")
+def _plot_top3_on_mask(outdir, M_clean, top3_masks, alpha, title, fname):
+    fig = new_figure()
+    ax = fig.add_subplot()
+    ax.imshow(M_clean, origin="upper", alpha=alpha)
+    ax.set_title(title)
+    colors = ["red", "green", "blue"]
+    for idx, mask_i in enumerate(top3_masks):
+        ax.contour(mask_i.astype(float), levels=[0.5], colors=[colors[idx]], linewidths=2.0)
+    return save_fig(fig, outdir, fname)
+
+
+def plot_and_save_all(T, outdir, p2, p98, G, Gs, tau, M_clean, labeled_clean, regions_sorted,
+                      max_workers=1):
+    top = regions_sorted[0] if len(regions_sorted) > 0 else None
+    # Region masks are built once here and shared by the overlay tasks (which then no
+    # longer need labeled_clean or their own full-image label scans).
+    top3_masks = [labeled_clean == reg["ID"] for reg in regions_sorted[:3]]
+    top_mask = top3_masks[0] if top3_masks else None
+    tasks = [
+        (_plot_histogram, (outdir, T)),                                               # 1
+        (_plot_thermal, (outdir, T, p2, p98, "jet", "thermal_jet.png")),              # 2
+        (_plot_thermal, (outdir, T, p2, p98, "inferno", "thermal_inferno.png")),      # 3
+        (_plot_gradient_map, (outdir, G)),                                            # 4
+        (_plot_threshold_overlay, (outdir, Gs, tau)),                                 # 5
+        (_plot_binary_mask, (outdir, M_clean)),                                       # 6
+        (_plot_hotspot_overlay, (outdir, T, p2, p98, top, top_mask)),                 # 7
+        (_plot_top3_on_mask, (outdir, M_clean, top3_masks, 0.3,                       # 8
+                              "Top 3 Hotspots Overlay (hottest→coolest)", "top3_hotspots_mask.png")),
+        (_plot_top3_on_mask, (outdir, M_clean, top3_masks, 0.4,                       # 9
+                              "Top 3 Overlaid on Candidate Mask", "overlay_candidate_hotspots.png")),
+    ]
+    # Inline by default: a spawned worker re-imports the whole module (~1.3 s) before it draws
+    # anything, which costs more than the ~0.9 s sequential plot phase.
+    max_workers = min(max_workers, len(tasks))
+    if max_workers <= 1:
+        return [fn(*args) for fn, args in tasks]
+    # spawn, not fork: forking after Numba's parallel kernels have started its thread pool can deadlock
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+        futures = [pool.submit(fn, *args) for fn, args in tasks]
+        return [f.result() for f in futures]
 
 
 def save_hotspot_csv(outdir: str, regions_sorted: list):
     df = pd.DataFrame(regions_sorted, columns=["ID","area_px","Tmax_C","Tmean_C","Tbg_C","DeltaT_C","row","col"])
     csv_path = os.path.join(outdir, "hotspot_stats.csv")
-    df.to_csv(csv_path, index=False)
+    # T is float32: round away float32 representation noise (38.9 -> 38.900001525878906)
+    df.round(4).to_csv(csv_path, index=False)
     return csv_path
 
 
@@ -445,6 +733,12 @@ def main():
     parser.add_argument("--ring-width", type=int, default=5, help="Annulus ring width for local background (default 5)")
     parser.add_argument("--clip-lo", type=float, default=2, help="Histogram lower clip percentile (default 2)")
     parser.add_argument("--clip-hi", type=float, default=98, help="Histogram upper clip percentile (default 98)")
+    parser.add_argument("--reuse-smoothed-gradient", action="store_true",
+                        help="Report/plot the smoothed hotspot gradient as the gradient map instead of "
+                             "a separate raw-T gradient pass")
+    parser.add_argument("--plot-workers", type=int, default=1,
+                        help="Worker processes for rendering figures (default 1 = inline; "
+                             "each worker pays a full module import)")
     args = parser.parse_args()
 
     ensure_outdir(args.outdir)
@@ -463,11 +757,7 @@ def main():
 
     # 3) Visualizations happen later in plot_and_save_all()
 
-    # 4) Gradient map
-    G, g_stats = gradient_map(T)
-    print(g_stats)
-
-    # 5) Hotspots
+    # 4) Hotspots (smoothed gradient G_s computed here)
     Gs, tau, M_clean, labeled_clean, regions_sorted = hotspot_detection(
         T,
         gaussian_sigma=args.gaussian_sigma,
@@ -476,8 +766,13 @@ def main():
         ring_width=args.ring_width
     )
 
+    # 5) Gradient map (raw T, or the cached G_s when --reuse-smoothed-gradient)
+    G, g_stats = gradient_map(T, G=Gs if args.reuse_smoothed_gradient else None)
+    print(g_stats)
+
     # 6) Visual outputs
-    plot_and_save_all(T, args.outdir, p2, p98, G, Gs, tau, M_clean, labeled_clean, regions_sorted)
+    plot_and_save_all(T, args.outdir, p2, p98, G, Gs, tau, M_clean, labeled_clean, regions_sorted,
+                      max_workers=args.plot_workers)
 
     # 7) CSV export
     csv_path = save_hotspot_csv(args.outdir, regions_sorted)